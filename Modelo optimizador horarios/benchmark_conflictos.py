@@ -0,0 +1,103 @@
+"""Benchmark del conteo de choques docente/aula usado en `evaluate_schedule`.
+
+Compara el método original (todos los pares de franjas por recurso con
+`slot_overlaps`) contra la rejilla de ocupación `count_overlap_pairs`, verifica
+que ambos dan el mismo número de choques y reporta el tiempo de cada uno.
+
+Uso (desde esta carpeta):
+    python benchmark_conflictos.py [--repeats 20] [--escalas 1 5 20 50]
+"""
+import argparse
+import random
+import time
+from collections import defaultdict
+
+import motor
+
+
+def count_overlap_pairs_pairwise(assignments):
+    """Implementación de referencia: compara todos los pares por recurso."""
+    slots_by_resource = defaultdict(list)
+    for r_idx, slot_idx in assignments:
+        slots_by_resource[r_idx].append(slot_idx)
+    pairs = 0
+    for slots in slots_by_resource.values():
+        for a in range(len(slots)):
+            for b in range(a + 1, len(slots)):
+                if motor.slot_overlaps(slots[a], slots[b]):
+                    pairs += 1
+    return pairs
+
+
+def random_assignments(n_blocks, n_resources, rng):
+    """Asignaciones (recurso, franja) aleatorias con la mezcla de duraciones del bloque real."""
+    durations = [b["duration"] for b in motor.BLOCKS]
+    out = []
+    for i in range(n_blocks):
+        dur = durations[i % len(durations)]
+        out.append((rng.randrange(n_resources), rng.choice(motor.SLOT_INDICES_BY_DURATION[dur])))
+    return out
+
+
+def bundled_assignments(n_individuals, rng):
+    """Pares (docente, franja) y (aula, franja) de individuos del generador inicial."""
+    random.seed(rng.random())
+    cases = []
+    for _ in range(n_individuals):
+        ind = motor.individual_generator()
+        cases.append(([(g[2], g[0]) for g in ind], len(motor.DOCENTES)))
+        cases.append(([(g[1], g[0]) for g in ind], len(motor.AULAS)))
+    return cases
+
+
+def time_cases(cases, repeats):
+    t_pair = t_grid = 0.0
+    for assignments, n_resources in cases:
+        expected = count_overlap_pairs_pairwise(assignments)
+        got = motor.count_overlap_pairs(assignments, n_resources)
+        if expected != got:
+            raise AssertionError(f"conteo distinto: pares={expected} rejilla={got}")
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            count_overlap_pairs_pairwise(assignments)
+        t1 = time.perf_counter()
+        for _ in range(repeats):
+            motor.count_overlap_pairs(assignments, n_resources)
+        t2 = time.perf_counter()
+        t_pair += t1 - t0
+        t_grid += t2 - t1
+    n = len(cases) * repeats
+    return t_pair / n, t_grid / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 5, 20, 50],
+                        help="múltiplos de la instancia incluida (bloques y docentes; las aulas se comparten)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"{'instancia':<28}{'bloques':>8}{'pares (us)':>14}{'rejilla (us)':>14}{'speedup':>10}")
+
+    cases = bundled_assignments(20, rng)
+    t_pair, t_grid = time_cases(cases, args.repeats)
+    print(f"{'datos_sistema.json':<28}{motor.NUM_BLOCKS:>8}{t_pair * 1e6:>14.1f}{t_grid * 1e6:>14.1f}{t_pair / t_grid:>9.1f}x")
+
+    for k in args.escalas:
+        n_blocks = motor.NUM_BLOCKS * k
+        n_teachers = len(motor.DOCENTES) * k
+        n_rooms = len(motor.AULAS)
+        cases = []
+        for _ in range(5):
+            cases.append((random_assignments(n_blocks, n_teachers, rng), n_teachers))
+            cases.append((random_assignments(n_blocks, n_rooms, rng), n_rooms))
+        repeats = max(1, args.repeats // k)
+        t_pair, t_grid = time_cases(cases, repeats)
+        label = f"sintética x{k}"
+        print(f"{label:<28}{n_blocks:>8}{t_pair * 1e6:>14.1f}{t_grid * 1e6:>14.1f}{t_pair / t_grid:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
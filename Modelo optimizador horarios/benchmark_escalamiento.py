@@ -0,0 +1,169 @@
+"""Benchmark de escalamiento del optimizador sobre instancias sintéticas.
+
+Para cada escala genera una instancia con `generar_instancia.py` (múltiplos de la
+instancia incluida: 16 docentes, 30 asignaturas y 12 aulas) y, en un proceso
+aparte con esa instancia como `datos_sistema.json`, mide:
+
+- tiempo de importación de `motor` y de construcción de la instancia (ProblemInstance),
+- tiempo de generación y evaluación de la población inicial,
+- evaluaciones por segundo (`evaluate_schedule` y `evaluate_population`),
+- reparaciones por segundo (`repair_offspring`),
+- generaciones por segundo (`_evolve_generation`, sin caché),
+- memoria máxima residente del proceso.
+
+El reporte se escribe en JSON (por defecto `resultados/benchmark_escalamiento.json`)
+junto con el commit, las versiones y los parámetros, para comparar entre commits.
+
+Uso (desde esta carpeta):
+    python benchmark_escalamiento.py [--escalas 1 5 10 20] [--poblacion 100] [--generaciones 3]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from generar_instancia import write_instance
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_COUNTS = {"docentes": 16, "asignaturas": 30, "aulas": 12}
+
+
+def measure(pop_size, ngen, seed):
+    """Mide la instancia del directorio actual. Se ejecuta en el proceso hijo."""
+    t0 = time.perf_counter()
+    import motor
+    import_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    motor.use_instance(motor.ProblemInstance.load("datos_sistema.json"))
+    instance_s = time.perf_counter() - t0
+
+    random.seed(seed)
+    t0 = time.perf_counter()
+    pop = motor._init_population(pop_size)
+    init_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for ind in pop:
+        motor.evaluate_schedule(ind)
+    scalar_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    motor.evaluate_population(pop)
+    batch_s = time.perf_counter() - t0
+
+    copies = [motor.toolbox.clone(ind) for ind in pop]
+    report = {}
+    t0 = time.perf_counter()
+    for ind in copies:
+        motor.repair_offspring(ind, report)
+    repair_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(ngen):
+        motor._evolve_generation(pop, 0.8, 0.4)
+    gens_s = time.perf_counter() - t0
+
+    return {
+        "bloques": motor.NUM_BLOCKS,
+        "franjas": motor.TOTAL_SLOTS,
+        "import_s": import_s,
+        "carga_instancia_s": instance_s,
+        "init_poblacion_s": init_s,
+        "evaluaciones_por_s": pop_size / scalar_s,
+        "evaluaciones_lote_por_s": pop_size / batch_s,
+        "reparaciones_por_s": pop_size / repair_s,
+        "choques_reparados": report.get("fixed", 0),
+        "choques_sin_resolver": report.get("unfixed", 0),
+        "generaciones_por_s": ngen / gens_s if ngen else None,
+        "mejor_fitness": max(ind.fitness.values[0] for ind in pop),
+        # ru_maxrss viene en KB en Linux y en bytes en macOS
+        "memoria_max_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        / (1024 * 1024 if sys.platform == "darwin" else 1024),
+    }
+
+
+def run_scale(k, args):
+    counts = {name: n * k for name, n in BASE_COUNTS.items()}
+    workdir = tempfile.mkdtemp(prefix=f"horarios_x{k}_")
+    try:
+        write_instance(
+            os.path.join(workdir, "datos_sistema.json"),
+            n_docentes=counts["docentes"], n_asignaturas=counts["asignaturas"], n_aulas=counts["aulas"],
+            densidad=args.densidad, fanout=args.fanout, frac_practicas=args.frac_practicas,
+            seed=args.seed + k,
+        )
+        cmd = [sys.executable, os.path.abspath(__file__), "--medir",
+               "--poblacion", str(args.poblacion), "--generaciones", str(args.generaciones),
+               "--seed", str(args.seed)]
+        env = dict(os.environ, PYTHONPATH=BASE_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""),
+                   MPLBACKEND="Agg")
+        out = subprocess.run(cmd, cwd=workdir, env=env, capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {"escala": k, **counts, **result}
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 5, 10, 20],
+                        help="múltiplos de la instancia incluida (docentes, asignaturas y aulas)")
+    parser.add_argument("--poblacion", type=int, default=100)
+    parser.add_argument("--generaciones", type=int, default=3)
+    parser.add_argument("--densidad", type=float, default=1.0)
+    parser.add_argument("--fanout", type=int, default=1)
+    parser.add_argument("--frac-practicas", type=float, default=0.4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--salida", default=os.path.join("resultados", "benchmark_escalamiento.json"))
+    parser.add_argument("--medir", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        print(json.dumps(measure(args.poblacion, args.generaciones, args.seed)))
+        return
+
+    import numpy as np
+    rows = []
+    print(f"{'escala':>6}{'bloques':>9}{'init (s)':>10}{'eval/s':>10}{'lote/s':>10}"
+          f"{'repar/s':>10}{'gen/s':>9}{'mem (MB)':>10}")
+    for k in args.escalas:
+        row = run_scale(k, args)
+        rows.append(row)
+        print(f"{k:>6}{row['bloques']:>9}{row['init_poblacion_s']:>10.2f}{row['evaluaciones_por_s']:>10.0f}"
+              f"{row['evaluaciones_lote_por_s']:>10.0f}{row['reparaciones_por_s']:>10.1f}"
+              f"{row['generaciones_por_s']:>9.2f}{row['memoria_max_mb']:>10.0f}")
+
+    report = {
+        "commit": git_commit(),
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "parametros": {k: v for k, v in vars(args).items() if k not in ("medir", "salida")},
+        "resultados": rows,
+    }
+    os.makedirs(os.path.dirname(args.salida) or ".", exist_ok=True)
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Reporte escrito en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
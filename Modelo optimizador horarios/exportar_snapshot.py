@@ -0,0 +1,31 @@
+"""Convierte un snapshot binario (`.npz`) del salón de la fama o de la población a JSON legible.
+
+Los snapshots guardan solo genomas y fitness; este script los carga con la
+instancia indicada (por defecto `datos_sistema.json`) y escribe, por individuo,
+el fitness, los genes y los eventos legibles (asignatura, grupo, día, hora, aula
+y docente).
+
+Uso (desde esta carpeta):
+    python exportar_snapshot.py [resultados/hall_of_fame.npz] [--salida hof.json] [--instancia datos_sistema.json]
+"""
+import argparse
+import os
+
+import motor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("snapshot", nargs="?", default=os.path.join("resultados", "hall_of_fame.npz"))
+    parser.add_argument("--salida", default=None, help="ruta del JSON (por defecto junto al snapshot)")
+    parser.add_argument("--instancia", default=motor.DATA_FILE)
+    args = parser.parse_args()
+
+    motor.use_instance(motor.ProblemInstance.load(args.instancia))
+    meta = motor.read_snapshot_meta(args.snapshot)
+    path = motor.snapshot_to_json(args.snapshot, args.salida)
+    print(f"Snapshot '{meta['kind']}' ({len(meta['blocks'])} bloques) exportado en {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Generador de instancias sintéticas con el formato de `datos_sistema.json`.
+
+Produce docentes, asignaturas y aulas con la misma estructura que el archivo
+incluido, de modo que `motor.py` las carga sin cambios. Se pueden ajustar los
+tamaños, la densidad de disponibilidad docente, cuántos docentes lista cada
+asignatura en `possible_teachers` y la proporción de aulas prácticas.
+
+Uso (desde esta carpeta):
+    python generar_instancia.py --docentes 160 --asignaturas 300 --aulas 120 --salida instancia.json
+"""
+import argparse
+import json
+import random
+
+DIAS = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado"]
+# mezcla de vinculaciones y límites de horas de la instancia incluida
+VINCULACIONES = [("planta", 16, 9), ("catedra", 12, 4), ("ocasional", 24, 3)]
+HORAS_ASIGNATURA = [(4, 15), (6, 13), (5, 1), (2, 1)]
+CONFIGURACION = {
+    "capacidad_maxima_grupo": 28,
+    "horas_maximas_planta": 16,
+    "horas_maximas_ocasional": 24,
+    "horas_maximas_catedra": 12,
+    "prioridad_asignacion": ["alta", "media", "baja"],
+    "preferencia_docente": ["especializado", "general"],
+}
+
+
+def _weighted(rng, options):
+    values = [o[:-1] for o in options]
+    weights = [o[-1] for o in options]
+    return rng.choices(values, weights)[0]
+
+
+def _disponibilidad(rng, densidad):
+    """Un rango por día hábil de ~densidad * 15 horas (07:00-22:00), con inicio al azar.
+    Con densidad 1 el docente queda disponible toda la semana hábil, como en la instancia incluida.
+    """
+    horas = max(3, min(15, round(15 * densidad)))
+    disp = {}
+    for dia in DIAS[:5]:
+        if densidad < 1 and rng.random() > 0.5 + densidad / 2:
+            continue
+        inicio = rng.randint(7, 22 - horas)
+        disp[dia] = [f"{inicio:02d}:00-{inicio + horas:02d}:00"]
+    if not disp:
+        disp[DIAS[0]] = [f"07:00-{7 + horas:02d}:00"]
+    return disp
+
+
+def generate_instance(n_docentes=16, n_asignaturas=30, n_aulas=12, densidad=1.0, fanout=1,
+                      frac_practicas=0.4, frac_mixtas=0.9, seed=42):
+    """Instancia sintética como dict con las claves de `datos_sistema.json`.
+
+    - `densidad`: fracción de la franja 07:00-22:00 disponible por día (y probabilidad
+      de que el día esté disponible).
+    - `fanout`: docentes listados en `possible_teachers` de cada asignatura (0 = ninguno).
+    - `frac_practicas`: fracción de aulas prácticas (el resto son teóricas).
+    - `frac_mixtas`: fracción de asignaturas teórico-prácticas; las demás se reparten
+      entre teóricas y prácticas según `frac_practicas`.
+    """
+    rng = random.Random(seed)
+    especialidades = [f"especialidad {k + 1}" for k in range(max(1, n_asignaturas))]
+
+    docentes = {}
+    for k in range(n_docentes):
+        tipo, limite = _weighted(rng, VINCULACIONES)
+        docentes[f"D{k + 1:03d}"] = {
+            "nombre": f"Docente {k + 1}",
+            "tipo_vinculacion": tipo,
+            "limite_horas_semanales": limite,
+            "especialidades": rng.sample(especialidades, min(2, len(especialidades))),
+            "disponibilidad": _disponibilidad(rng, densidad),
+        }
+    doc_ids = list(docentes)
+
+    asignaturas = {}
+    for k in range(n_asignaturas):
+        r = rng.random()
+        if r < frac_mixtas:
+            tipo_aula = "teorico-practica"
+        elif r < frac_mixtas + (1 - frac_mixtas) * frac_practicas:
+            tipo_aula = "practica"
+        else:
+            tipo_aula = "teorica"
+        listados = rng.sample(doc_ids, min(fanout, len(doc_ids))) if fanout else []
+        for did in listados:
+            # los docentes listados comparten la especialidad de la asignatura
+            if especialidades[k] not in docentes[did]["especialidades"]:
+                docentes[did]["especialidades"].append(especialidades[k])
+        asignaturas[str(100000 + k)] = {
+            "nombre": f"Asignatura {k + 1}",
+            "horas_semanales": _weighted(rng, HORAS_ASIGNATURA)[0],
+            "num_estudiantes": rng.randint(11, 70),
+            "tipo_aula": tipo_aula,
+            "possible_teachers": listados,
+            "especialidades": [especialidades[k]],
+        }
+
+    n_practicas = round(n_aulas * frac_practicas)
+    aulas = {}
+    for k in range(n_aulas):
+        tipo = "practica" if k < n_practicas else "teorica"
+        aulas[f"{'LAB' if tipo == 'practica' else 'AULA'}{k + 1:03d}"] = {
+            "capacidad": CONFIGURACION["capacidad_maxima_grupo"],
+            "disponibilidad": "alta",
+            "tipo": tipo,
+            "type": tipo,
+        }
+
+    return {
+        "docentes": docentes,
+        "asignaturas": asignaturas,
+        "aulas": aulas,
+        "configuracion": dict(CONFIGURACION),
+    }
+
+
+def write_instance(path, **kwargs):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(generate_instance(**kwargs), f, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docentes", type=int, default=16)
+    parser.add_argument("--asignaturas", type=int, default=30)
+    parser.add_argument("--aulas", type=int, default=12)
+    parser.add_argument("--densidad", type=float, default=1.0,
+                        help="fracción de la franja diaria 07:00-22:00 disponible (0-1)")
+    parser.add_argument("--fanout", type=int, default=1, help="docentes listados por asignatura")
+    parser.add_argument("--frac-practicas", type=float, default=0.4, help="fracción de aulas prácticas")
+    parser.add_argument("--frac-mixtas", type=float, default=0.9, help="fracción de asignaturas teórico-prácticas")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--salida", default="instancia_sintetica.json")
+    args = parser.parse_args()
+    write_instance(
+        args.salida,
+        n_docentes=args.docentes, n_asignaturas=args.asignaturas, n_aulas=args.aulas,
+        densidad=args.densidad, fanout=args.fanout, frac_practicas=args.frac_practicas,
+        frac_mixtas=args.frac_mixtas, seed=args.seed,
+    )
+    print(f"Instancia escrita en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()